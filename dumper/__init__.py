@@ -308,31 +308,47 @@ different packages:
 """
 
 
-import sys, string
-from types import *
-
-if sys.version < '3':
-    integer_types = (int, long,)
-    string_types = (basestring,)
-    split = string.split
-else:
-    integer_types = (int,)
-    string_types = (str,)
-    split = str.split
-
-DICT_TYPES = {type(dict()): 1}
-try:
-    from BTree import BTree
-    DICT_TYPES[BTree] = 1
-except ImportError:
-    pass
-try:
-    from BTrees import OOBTree, OIBTree, IOBTree
-    DICT_TYPES[OOBTree.OOBTree] = 1
-    DICT_TYPES[OIBTree.OIBTree] = 1
-    DICT_TYPES[IOBTree.IOBTree] = 1
-except ImportError:
-    pass
+import sys
+from functools import lru_cache
+from types import (BuiltinFunctionType, BuiltinMethodType, CodeType,
+                   FrameType, FunctionType, LambdaType, MappingProxyType,
+                   MethodType, ModuleType, TracebackType)
+
+integer_types = (int,)
+string_types = (str,)
+
+# types dumped like dictionaries
+DICT_TYPES = frozenset((dict,))
+
+# (module, class) of the optional Zope BTree types, which are dumped like
+# dictionaries.  They're registered by _register_btree_types() rather than
+# imported here: there can't be any BTrees to dump until their module has
+# been loaded, and most users never load it at all.  Registration is tried
+# when a type dumper doesn't recognise turns up from a BTree* module (see
+# _new_btree_type()), so nothing is looked up while dumping anything else.
+_btree_pending = [('BTree', 'BTree'),
+                  ('BTrees.OOBTree', 'OOBTree'),
+                  ('BTrees.OIBTree', 'OIBTree'),
+                  ('BTrees.IOBTree', 'IOBTree')]
+
+def _register_btree_types ():
+    global DICT_TYPES
+    for (module_name, class_name) in list(_btree_pending):
+        # a module of that name that doesn't export the class isn't the
+        # one we're after (it could be the user's own BTree.py)
+        btree_type = getattr(sys.modules.get(module_name), class_name, None)
+        if btree_type is not None:
+            DICT_TYPES = DICT_TYPES | frozenset((btree_type,))
+            _SHORT_HANDLERS[btree_type] = _short_dict
+            _btree_pending.remove((module_name, class_name))
+
+def _new_btree_type (t):
+    # only called while _btree_pending is non-empty
+    module = getattr(t, '__module__', None)
+    if isinstance(module, str) and module.startswith('BTree'):
+        _register_btree_types()
+        return t in DICT_TYPES
+    return False
 
 # 
 # IDEAS on how to restrict how deep we go when dumping:
@@ -355,41 +371,34 @@ instance_dump = 'module'                # or 'all', 'none', 'package':
 
 # arg -- this is necessary because the .__name__ of a type object
 # under JPython is a bit ugly (eg. 'org.python.core.PyList' not 'list')
-TYPE_NAMES = {
+#
+# Keyed by the types themselves: these used to be written as type(dict),
+# type(list) etc., which are all just 'type', so the entries overwrote
+# each other and the built-ins fell through to __name__.
+TYPE_NAMES = MappingProxyType({
     BuiltinFunctionType: 'builtin',
     BuiltinMethodType: 'builtin',
+    bytes: 'bytes',
     CodeType: 'code',
-    type(complex): 'complex',
-    type(dict): 'dictionary',
-    type(float): 'float',
+    complex: 'complex',
+    dict: 'dictionary',
+    float: 'float',
     FrameType: 'frame',
     FunctionType: 'function',
-    type(int): 'int',
+    int: 'int',
     LambdaType: 'function',
-    type(list): 'list',
+    list: 'list',
     MethodType: 'instance method',
     ModuleType: 'module',
     type(None): 'None',
-    type(string): 'string',
+    str: 'string',
     TracebackType: 'traceback',
-    type(tuple): 'tuple',
-    type(type): 'type',
-    }
-try:
-    TYPE_NAMES[ClassType] = 'class'
-    TYPE_NAMES[DictType] = 'dictionary'
-    TYPE_NAMES[DictProxyType] = 'dictionary'
-    TYPE_NAMES[EllipsisType] = 'ellipsis'
-    TYPE_NAMES[FileType] = 'file'
-    TYPE_NAMES[InstanceType] = 'instance'
-    TYPE_NAMES[LongType] = 'long int'
-    TYPE_NAMES[SliceType] = 'slice'
-    TYPE_NAMES[UnboundMethodType] = 'instance method'
-    TYPE_NAMES[UnicodeType] = 'unicode',
-    TYPE_NAMES[XRangeType] = 'xrange',
-except NameError: pass
+    tuple: 'tuple',
+    type: 'type',
+    })
 
 
+@lru_cache(maxsize=256)
 def get_type_name (some_type):
     try:
         return TYPE_NAMES[some_type]
@@ -397,18 +406,45 @@ def get_type_name (some_type):
         return some_type.__name__
 
 
+# kinds of item on Dumper._stack
+_NODE = 'node'
+_ENTRY = 'entry'
+_LEAVE = 'leave'
+
+
+# Dumper's per-dump() state, as it is between dumps
+_IDLE_STATE = {
+    'seen': None,
+    'containing_instance': None,
+    '_stack': None,
+    '_short_cache': None,
+    '_eff_max_depth': None,
+    '_eff_instance_dump': None,
+    '_buf': None,
+    }
+
+
 class Dumper:
 
     def __init__ (self, max_depth=None, instance_dump=None, output=None):
-        self._max_depth = max_depth
-        self._instance_dump = instance_dump
+        # set straight into __dict__: dumps() makes a Dumper per call, and
+        # __setattr__ would be most of the cost of a small one
+        state = self.__dict__
+        state['_max_depth'] = max_depth
+        state['_instance_dump'] = instance_dump
         if output is None:
-            self.out = sys.stdout
+            state['out'] = sys.stdout
         else:
-            self.out = output
+            state['out'] = output
+        state.update(_IDLE_STATE)
+
+    # Only these settings are stored as '_' + name and fall back to the
+    # module globals; the internal per-dump state (_buf, _stack, ...) must
+    # not be reachable or assignable without its underscore.
+    _settings = ('max_depth', 'instance_dump')
 
     def __getattr__ (self, attr):
-        if '_' + attr in self.__dict__:
+        if attr in Dumper._settings and '_' + attr in self.__dict__:
             val = self.__dict__['_' + attr]
             if val is None:             # not defined in object;
                 # attribute exists in instance (after adding _), but
@@ -424,113 +460,241 @@ class Dumper:
 
 
     def __setattr__ (self, attr, val):
-        if '_' + attr in self.__dict__:
+        if attr in Dumper._settings and '_' + attr in self.__dict__:
             self.__dict__['_' + attr] = val
         else:
             self.__dict__[attr] = val
 
+    # Output is collected in self._buf while dumping and handed to
+    # self.out in a single write() at the end of dump(), rather than
+    # issuing two or three writes for every line.
     def _writeln (self, line):
-        try:
-            self.out.write(line.decode("utf-8"))
-        except AttributeError:
-            self.out.write(line) # python 3
-        self.out.write(u"\n")
+        self._buf.append(line)
+        self._buf.append("\n")
         
     def _write (self, text):
-        try:
-            self.out.write(text.decode("utf-8"))
-        except AttributeError:
+        self._buf.append(text)
+
+    def _flush (self):
+        text = ''.join(self._buf)
+        del self._buf[:]
+        if text:
             self.out.write(text)
 
+    # A Dumper can be reused for any number of dump() calls, and dump()
+    # is re-entrant: if dumping calls back into it (say, a __str__ that
+    # dumps something while object_summary() describes its instance),
+    # the outer dump's state is put back once the inner one is done.
     def dump (self, val, indent='', summarize=1):
-        self.seen = {}
-        self.containing_instance = []
-        self._dump (val, indent=indent, summarize=summarize)
+        self._walk (self._schedule_node, val, 0, indent, summarize)
 
+    # dump_dict(), dump_sequence() and dump_instance() dump the contents
+    # of a container on their own, as they always have; the dump itself
+    # schedules containers with the _schedule_*() methods below instead.
+    def dump_dict (self, a_dict, depth, indent, shallow_attrs=()):
+        self._walk (self._schedule_dict, a_dict, depth, indent, shallow_attrs)
 
-    def _dump (self, val, depth=0, indent='', summarize=1):
+    def dump_sequence (self, seq, depth, indent):
+        self._walk (self._schedule_sequence, seq, depth, indent)
 
-        t = type (val)
+    def dump_instance (self, inst, depth, indent, summarize=1):
+        self._walk (self._schedule_instance, inst, depth, indent, summarize)
+
+    def _walk (self, schedule, *args):
+        # set up the per-dump state, schedule() the first work items, and
+        # run _dump() over them
+        #
+        # The per-dump state is read and written through __dict__
+        # directly: going through __setattr__ (and __getattr__ for the
+        # settings) costs more than dumping a small value does.
+        state = self.__dict__
+        if state['_buf'] is None:
+            outer = _IDLE_STATE
+        else:
+            # nested in another dump(): keep its state to put back, and
+            # its output ahead of ours
+            outer = {name: state[name] for name in _IDLE_STATE}
+            self._flush()
+        state['seen'] = set()
+        state['containing_instance'] = []
+        state['_short_cache'] = {}
+        # resolve the effective settings once, falling back to the module
+        # globals, rather than looking them up for every node
+        setting = state['_max_depth']
+        state['_eff_max_depth'] = max_depth if setting is None else setting
+        setting = state['_instance_dump']
+        state['_eff_instance_dump'] = (instance_dump if setting is None
+                                       else setting)
+        state['_buf'] = []
+        state['_stack'] = []
+        try:
+            schedule (*args)
+            self._dump ()
+        finally:
+            # flush whatever we have, even if dumping blew up part way
+            self._flush()
+            state.update(outer)
+
+    def _short_form (self, val):
+        # Classify and format in one go: short_dump(val) if val is short
+        # enough for one line, or None if its contents need dumping.
+        # Containers are remembered for the rest of the dump, so one that
+        # turns up again is neither rescanned nor reformatted.  The cached
+        # entry holds a reference to val so that its id() can't be reused
+        # by another object before the dump is over.
+        t = type(val)
+        if t in _SCALAR_TYPES:
+            return repr(val)
+        if not (t is list or t is tuple or t in DICT_TYPES or
+                isinstance(val, (list, tuple))):
+            return short_dump(val) if short_value(val) else None
+        cached = self._short_cache.get(id(val))
+        if cached is None:
+            form = short_dump(val) if short_value(val) else None
+            cached = self._short_cache[id(val)] = (form, val)
+        return cached[0]
+
+
+    # _dump() walks the structure with an explicit stack of work items
+    # rather than recursing, so deeply nested values can't run into the
+    # interpreter's recursion limit.  The _schedule_*() methods schedule
+    # a value, or the contents of a container, by pushing onto
+    # self._stack.  Each item is one of:
+    #
+    #   (_NODE, val, depth, indent, summarize)
+    #       dump val
+    #   (_ENTRY, label, val, depth, indent, shallow)
+    #       one 'label: ...' line of a container, and val's contents
+    #   (_LEAVE,)
+    #       done with the instance on top of containing_instance
+    #
+    # Items are pushed in reverse, so that they pop off in output order.
+
+    def _schedule_node (self, val, depth, indent, summarize):
+        self._stack.append((_NODE, val, depth, indent, summarize))
+
+    def _dump (self):
+        stack = self._stack
+        pop = stack.pop
+        writeln = self._writeln
+        short_form = self._short_form
+        builtin_summary = _BUILTIN_SUMMARY.get
+        seen = self.seen
+        max_depth = self._eff_max_depth
+
+        while stack:
+            item = pop()
+            kind = item[0]
+
+            if kind is _ENTRY:
+                _, label, val, depth, indent, shallow = item
+                form = short_form (val)
+                if form is None and shallow:
+                    form = short_dump (val)
+                if form is not None:
+                    writeln(f"{indent}{label!s}: {form}")
+                    continue
+                # the entry's line is the summary; its contents go below.
+                # Built-in containers are by far the most common here, so
+                # format theirs directly rather than via object_summary()
+                fmt = builtin_summary (type (val))
+                if fmt is not None:
+                    writeln(f"{indent}{label!s}: {fmt.format(id (val))}")
+                else:
+                    writeln(f"{indent}{label!s}: {object_summary(val)}")
+                indent = indent + '  '
+                summarize = 0
+
+            elif kind is _LEAVE:
+                del self.containing_instance[-1]
+                continue
 
-        if short_value (val):
-            self._write("%s%s" % (indent, short_dump (val)))
+            else:
+                _, val, depth, indent, summarize = item
+                form = short_form (val)
+                if form is not None:
+                    self._write(f"{indent}{form}")
+                    continue
 
-        else:
             depth = depth + 1
 
-            if depth > self.max_depth:
+            if depth > max_depth:
                 #raise SuppressedDump, "too deep"
-                self._writeln(indent + "contents suppressed (too deep)")
-                return
-
-            if self.seen.get(id(val)):
-                self._writeln(indent + "object already seen")
-                return
-
-            self.seen[id(val)] = 1
-
-            if t in DICT_TYPES:
-                if summarize:
-                    self._writeln("%s%s:" % (indent, object_summary (val)))
-                    indent = indent + '  '
-                self.dump_dict (val, depth, indent)
-
+                writeln(indent + "contents suppressed (too deep)")
+                continue
+
+            vid = id(val)
+            if vid in seen:
+                writeln(indent + "object already seen")
+                continue
+
+            seen.add(vid)
+
+            # exact built-in types first: identity tests are much cheaper
+            # than the issubclass() MRO walk needed for subclasses
+            t = type (val)
+            if t is list or t is tuple:
+                handler = self._schedule_sequence
+            elif t is dict or t in DICT_TYPES:
+                handler = self._schedule_dict
             elif issubclass(t, (list, tuple)):
-                if summarize:
-                    self._writeln("%s%s:" % (indent, object_summary (val)))
-                    indent = indent + '  '
-                self.dump_sequence (val, depth, indent)
-
+                handler = self._schedule_sequence
             elif is_instance(val):
-                self.dump_instance (val, depth, indent, summarize)
-
+                self._schedule_instance (val, depth, indent, summarize)
+                continue
+            elif _btree_pending and _new_btree_type(t):
+                handler = self._schedule_dict
             else:
                 raise RuntimeError("this should not happen")
 
+            if summarize:
+                writeln(f"{indent}{object_summary (val)}:")
+                indent = indent + '  '
+            handler (val, depth, indent)
+
     # _dump ()
 
 
-    def dump_dict (self, a_dict, depth, indent, shallow_attrs=()):
-        keys = list(a_dict.keys())
-        if type(keys) is type(list):
-            keys.sort()
-
-        for k in keys:
-            val = a_dict[k]
-            if short_value (val) or k in shallow_attrs:
-                self._writeln("%s%s: %s" % (indent, k, short_dump (val)))
-            else:
-                self._writeln("%s%s: %s" % (indent, k, object_summary(val)))
-                self._dump(val, depth, indent+'  ', summarize=0)
+    def _schedule_dict (self, a_dict, depth, indent, shallow_attrs=()):
+        if len(a_dict) > 1:
+            try:
+                keys = sorted(a_dict)
+            except TypeError:           # unorderable mixed keys
+                keys = list(a_dict)
+        else:
+            keys = list(a_dict)
 
+        push = self._stack.append
+        for k in reversed(keys):
+            push((_ENTRY, k, a_dict[k], depth, indent, k in shallow_attrs))
 
-    def dump_sequence (self, seq, depth, indent):
-        for i in range (len (seq)):
-            val = seq[i]
-            if short_value (val):
-                self._writeln("%s%d: %s" % (indent, i, short_dump (val)))
-            else:
-                self._writeln("%s%d: %s" % (indent, i, object_summary(val)))
-                self._dump(val, depth, indent+'  ', summarize=0)
 
+    def _schedule_sequence (self, seq, depth, indent):
+        push = self._stack.append
+        for i in range (len (seq) - 1, -1, -1):
+            push((_ENTRY, i, seq[i], depth, indent, False))
 
-    def dump_instance (self, inst, depth, indent, summarize=1):
+
+    def _schedule_instance (self, inst, depth, indent, summarize=1):
         
         if summarize:
-            self._writeln(indent + "%s " % object_summary (inst))
+            self._writeln(f"{indent}{object_summary (inst)} ")
             indent = indent + '  '
-        instance_dump = self.instance_dump
+        instance_dump = self._eff_instance_dump
+        current_module = inst.__class__.__module__
+        if isinstance(current_module, str):
+            current_package = tuple(current_module.rsplit('.', 1)[:-1])
+        else:                           # __module__ can be anything
+            current_package = ()
 
         # already dumping a containing instance, and have some restrictions
         # on instance-dumping?
         if self.containing_instance and instance_dump != 'all':
 
-            previous_instance = self.containing_instance[-1]
-            container_module = previous_instance.__class__.__module__
-            container_package = (split (container_module, '.'))[0:-1]
-
-            current_module = inst.__class__.__module__
-            current_package = (split (current_module, '.'))[0:-1]
+            # module and package were worked out when the container was
+            # pushed, so sibling attributes don't redo the split
+            (previous_instance, container_module,
+             container_package) = self.containing_instance[-1]
 
             #print "dumping instance contained in another instance %s:" % \
             #      previous_instance
@@ -565,10 +729,12 @@ class Dumper:
         # if in containing instance and have restrictions
 
         #self._writeln("")
-        self.containing_instance.append (inst)
+        self.containing_instance.append (
+            (inst, current_module, current_package))
+        # popped off containing_instance once the attributes are done
+        self._stack.append((_LEAVE,))
         shallow_attrs = getattr(inst, "_dump_shallow_attrs", [])
-        self.dump_dict (vars (inst), depth, indent, shallow_attrs)
-        del self.containing_instance[-1]
+        self._schedule_dict (vars (inst), depth, indent, shallow_attrs)
 
 
 # end class Dumper
@@ -576,18 +742,56 @@ class Dumper:
 
 # -- Utility functions -------------------------------------------------
 
+_ATOMIC_BASES = (type(None), float, complex) + integer_types + string_types
+
+# exact types known to be atomic; subclasses of _ATOMIC_BASES are added
+# the first time atomic_type() sees them, until there are
+# _MAX_ATOMIC_TYPES of them.  The set holds on to the types it has
+# learned, so the cap keeps a program that makes classes on the fly from
+# growing it (and keeping its classes alive) without bound; types past
+# it are just checked with issubclass() every time.
+_ATOMIC_TYPES = set((type(None), bool, float, complex) +
+                    integer_types + string_types)
+_MAX_ATOMIC_TYPES = 256
+
+# just the built-in atomic types: always short, and dumped as their repr()
+_SCALAR_TYPES = frozenset(_ATOMIC_TYPES)
+
 def atomic_type (t):
-    return issubclass(t,
-                      (None.__class__, float, complex)) \
-                      or issubclass(t, integer_types) \
-                      or issubclass(t, string_types)
+    if t in _ATOMIC_TYPES:
+        return True
+    if issubclass(t, _ATOMIC_BASES):
+        if len(_ATOMIC_TYPES) < _MAX_ATOMIC_TYPES:
+            _ATOMIC_TYPES.add(t)
+        return True
+    return False
+
+def _short_atomic (val):
+    return 1
+
+def _short_sequence (val):
+    return len (val) <= 10 and all(type(x) in _ATOMIC_TYPES or
+                                   atomic_type(type(x)) for x in val)
+
+def _short_dict (val):
+    return len (val) <= 5 and all(
+        (type(k) in _ATOMIC_TYPES or atomic_type(type(k))) and
+        (type(v) in _ATOMIC_TYPES or atomic_type(type(v)))
+        for (k, v) in val.items())
 
 def short_value (val):
-    #if atomic_type (type (val)):
-    #    return 1
+    handler = _SHORT_HANDLERS.get(type(val))
+    if handler is not None:
+        return handler(val)
+    return _short_value_slow(val)
 
+def _short_value_slow (val):
+    # subclasses of the built-in types, instances and everything else
     t = type(val)
 
+    if _btree_pending and t not in DICT_TYPES and _new_btree_type(t):
+        return _short_dict(val)
+
     if (t not in DICT_TYPES and not isinstance(val, list) and
         not isinstance(val, tuple) and not is_instance(val)):
         return 1
@@ -613,20 +817,8 @@ def short_dump (val):
         return repr(val)
     
     elif isinstance(val, (list, tuple)):
-        if isinstance(val, list):
-            retval = '['
-        else:
-            retval = '('
-        if len(val):
-            retval += short_dump(val[0])
-            for item in val[1:]:
-                retval += ", " + short_dump(item)
-        if isinstance(val, list):
-            retval += ']'
-        else:
-            retval += ')'
-        
-        return retval
+        opener, closer = ('[', ']') if isinstance(val, list) else ('(', ')')
+        return f"{opener}{', '.join([short_dump(x) for x in val])}{closer}"
 
     else:
         try:
@@ -635,44 +827,77 @@ def short_dump (val):
             val = "[got unicode error trying to represent value: " + str(err) +\
                 ']'
         return object_summary (val) + ': ' + repr(val)
+
+
+# short_value() dispatch on the exact type of the value
+_SHORT_HANDLERS = {list: _short_sequence, tuple: _short_sequence}
+for _t in DICT_TYPES:
+    _SHORT_HANDLERS[_t] = _short_dict
+for _t in _SCALAR_TYPES:
+    _SHORT_HANDLERS[_t] = _short_atomic
+del _t
     
         
 
+# object_summary() templates for the built-in containers, which are
+# neither instances nor classes
+_BUILTIN_SUMMARY = {t: f"<{get_type_name(t)} at 0x{{:x}}>"
+                    for t in (list, tuple, dict)}
+
 def object_summary (val):
     t = type (val)
 
-    if is_instance(val):
+    fmt = _BUILTIN_SUMMARY.get(t)
+    if fmt is not None:
+        return fmt.format(id (val))
+
+    elif is_instance(val):
         if hasattr(val, '__str__'):
             strform = ": " + str(val)
         else:
             strform = ""
-        return "<%s at %x%s>" % (val.__class__.__name__, id (val), strform)
+        return f"<{val.__class__.__name__} at {id (val):x}{strform}>"
 
     elif is_class(val):
-        return "<%s %s at 0x%x>" % (get_type_name(t), val.__name__, id (val))
+        return f"<{get_type_name(t)} {val.__name__} at 0x{id (val):x}>"
 
     else:
-        return "<%s at 0x%x>" % (get_type_name(t), id (val))
+        return f"<{get_type_name(t)} at 0x{id (val):x}>"
     
 
+# built-in types whose values never have a __dict__
+_NON_INSTANCE_TYPES = frozenset((type(None), bool, int, float, complex, str,
+                                 bytes, tuple, list, dict))
+
 def is_instance (val):
-    try:
-        if type(val) is InstanceType:
-            return 1
-        # instance of extension class, but not an actual extension class
-        elif (hasattr(val, '__class__') and
-              hasattr(val, '__dict__') and
-              not hasattr(val, '__bases__')):
-            return 1
-        else:
-            return 0
-    except NameError:  # Python > 3
-        return (hasattr(val, '__class__') and \
-              hasattr(val, '__dict__') and \
-              not hasattr(val, '__bases__'))
+    t = type(val)
+    if t in _NON_INSTANCE_TYPES:
+        return False
+    # has a __dict__ of its own, but isn't itself a class
+    return (not isinstance(val, type) and
+            getattr(val, '__dict__', None) is not None)
 
 def is_class (val):
-    return hasattr(val, '__bases__')
+    return isinstance(val, type)
+
+
+# Use the compiled versions of the per-element helpers when
+# dumper._fastpath has been built (setup.py does so if Cython is
+# installed); otherwise the pure Python definitions above stay in place.
+# The pure Python ones are kept here either way, for comparison in tests.
+_PURE_PYTHON = {'atomic_type': atomic_type, 'short_value': short_value,
+                'is_instance': is_instance, 'is_class': is_class,
+                'get_type_name': get_type_name}
+try:
+    from dumper import _fastpath
+except ImportError:
+    pass
+else:
+    _fastpath.setup(_ATOMIC_TYPES, _MAX_ATOMIC_TYPES, _ATOMIC_BASES,
+                    _NON_INSTANCE_TYPES, TYPE_NAMES, _SHORT_HANDLERS,
+                    _short_value_slow)
+    from dumper._fastpath import (atomic_type, short_value, is_instance,
+                                  is_class, get_type_name)
 
 
 default_dumper = Dumper()
@@ -683,14 +908,18 @@ def dump(val, output=None):
     else:
         Dumper(output=output).dump(val)
 
+class _ListBuffer:
+    # just enough of a file for Dumper: writes are collected in a list
+    def __init__ (self, buf):
+        self.write = buf.append
+
 def dumps(val, *argv):
-    from io import StringIO
-    out = StringIO()
-    dumper = Dumper(output=out)
+    buf = []
+    dumper = Dumper(output=_ListBuffer(buf))
     dumper.dump(val)
     for val in argv:
         dumper.dump(val)
-    return out.getvalue()
+    return ''.join(buf)
 
 
 if __name__ == "__main__":
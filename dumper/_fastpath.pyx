@@ -0,0 +1,98 @@
+# cython: language_level=3
+"""dumper._fastpath
+
+Compiled versions of the small predicates that dumper calls once for
+every element it dumps: atomic_type(), short_value(), is_instance(),
+is_class() and get_type_name().  They behave exactly like the pure
+Python definitions in dumper/__init__.py, which are used whenever this
+module hasn't been built.
+
+This is compiled with Cython rather than JIT-ed with something like
+Numba because the work is all generic Python object handling (type
+lookups, isinstance(), repr()), not numeric loops; Cython keeps the
+object semantics and just removes the interpreter dispatch.
+
+The lookup tables are the ones the pure Python module builds, handed
+over by setup(), so types that dumper learns about later (atomic
+subclasses, BTrees) are seen here too.
+"""
+
+cdef set _atomic_types
+cdef Py_ssize_t _max_atomic_types
+cdef tuple _atomic_bases
+cdef frozenset _non_instance_types
+cdef object _type_names
+cdef dict _short_handlers
+cdef object _short_value_slow
+
+
+def setup (atomic_types, max_atomic_types, atomic_bases, non_instance_types,
+           type_names, short_handlers, short_value_slow):
+    global _atomic_types, _max_atomic_types, _atomic_bases
+    global _non_instance_types, _type_names, _short_handlers, _short_value_slow
+    _atomic_types = atomic_types
+    _max_atomic_types = max_atomic_types
+    _atomic_bases = atomic_bases
+    _non_instance_types = non_instance_types
+    _type_names = type_names
+    _short_handlers = short_handlers
+    _short_value_slow = short_value_slow
+
+
+cdef inline bint _atomic (object t):
+    if t in _atomic_types:
+        return True
+    if issubclass(t, _atomic_bases):
+        if len(_atomic_types) < _max_atomic_types:
+            _atomic_types.add(t)
+        return True
+    return False
+
+def atomic_type (t):
+    return _atomic(t)
+
+
+cdef bint _short_sequence (object val):
+    if len(val) > 10:
+        return False
+    for x in val:
+        if not _atomic(type(x)):
+            return False
+    return True
+
+cdef bint _short_dict (object val):
+    if len(val) > 5:
+        return False
+    for (k, v) in val.items():
+        if not (_atomic(type(k)) and _atomic(type(v))):
+            return False
+    return True
+
+def short_value (val):
+    t = type(val)
+    if t is list or t is tuple:
+        return _short_sequence(val)
+    if t is dict:
+        return _short_dict(val)
+    handler = _short_handlers.get(t)
+    if handler is not None:
+        return handler(val)
+    return _short_value_slow(val)
+
+
+def is_instance (val):
+    if type(val) in _non_instance_types:
+        return False
+    # has a __dict__ of its own, but isn't itself a class
+    return (not isinstance(val, type) and
+            getattr(val, '__dict__', None) is not None)
+
+def is_class (val):
+    return isinstance(val, type)
+
+
+def get_type_name (some_type):
+    try:
+        return _type_names[some_type]
+    except KeyError:
+        return some_type.__name__
@@ -1,7 +1,21 @@
-from setuptools import setup, find_packages  # Always prefer setuptools over distutils
+from setuptools import setup, find_packages, Extension  # Always prefer setuptools over distutils
 from codecs import open  # To use a consistent encoding
 from os import path
 
+# The compiled helpers in dumper/_fastpath.pyx are optional: they are only
+# built when Cython is available, a failed C build doesn't fail the
+# install, and dumper falls back to pure Python without them.
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = cythonize([
+        Extension('dumper._fastpath', ['dumper/_fastpath.pyx'],
+                  optional=True)])
+    for ext in ext_modules:
+        ext.optional = True     # cythonize() doesn't carry this over
+
 here = path.abspath(path.dirname(__file__))
 
 # Get the long description from the relevant file
@@ -46,24 +60,22 @@ setup(
 
         # Specify the Python versions you support here. In particular, ensure
         # that you indicate whether you support Python 2, Python 3 or both.
-        'Programming Language :: Python :: 2',
-        'Programming Language :: Python :: 2.6',
-        'Programming Language :: Python :: 2.7',
-         'Programming Language :: Python :: 3',
-         'Programming Language :: Python :: 3.2',
-         'Programming Language :: Python :: 3.3',
-         'Programming Language :: Python :: 3.4',
-         'Programming Language :: Python :: 3.5',
-         'Programming Language :: Python :: 3.6',
-         'Programming Language :: Python :: 3.7'
+        'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: 3 :: Only',
+        'Programming Language :: Python :: 3.6',
+        'Programming Language :: Python :: 3.7'
     ],
 
+    # f-strings are used on the dump path
+    python_requires='>=3.6',
+
     # What does your project relate to?
     keywords='development',
 
     # You can just specify the packages manually here if your project is
     # simple. Or you can use find_packages().
     packages=find_packages(exclude=['contrib', 'docs', 'tests*']),
+    ext_modules=ext_modules,
 
     # List run-time dependencies here.  These will be installed by pip when your
     # project is installed. For an analysis of "install_requires" vs pip's
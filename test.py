@@ -1,8 +1,12 @@
 from __future__ import print_function
 from dumper import dump, dumps, Dumper
 import dumper
+import gc
 import io
+import pytest
 import sys
+import types
+import weakref
 
 buff = io.StringIO()
 dumper.default_dumper = Dumper(output=buff)
@@ -22,7 +26,7 @@ def test_do_dump_scalars():
     
 def do_dumps_multi_values():
     s = dumps(1, " is less than ", 10) # returns unicode string in py2
-    if sys.version < (3, 0):
+    if sys.version_info < (3, 0):
         s = s.encode('ascii', 'replace') # convert back to regular string
     dump(s)
     return "\"1' is less than '10\""
@@ -41,20 +45,221 @@ def do_dump_json():
         }
     dump(obj)
     return '''
-<dict at {WORD}>:
-  httpCode: 200
+<dictionary at {WORD}>:
   extensionData: <list at {WORD}>
-    0: <dict at {WORD}>:
+    0: <dictionary at {WORD}>:
       extensionValue: 'egg'
+  httpCode: 200
 '''
 
 def test_do_dump_json():
     assert_output_matches_template(do_dump_json)
+
+class Chatty:
+    def __init__(self):
+        self.x = 1
+    def __str__(self):
+        dump('inner') # re-enters the default dumper mid-dump
+        return 'chatty'
+
+def test_dump_reentrant():
+    try:
+        dump([Chatty()])
+        lines = buff.getvalue().split("\n")
+        assert lines[0].startswith("<list at ")
+        assert lines[1].startswith("'inner'  0: <Chatty at ")
+        assert lines[1].endswith(": chatty>")
+        assert lines[2:] == ["    x: 1", ""]
+    finally:
+        buff.truncate(0)
+        buff.seek(0)
+
+def test_dump_deep_nesting():
+    # deeper than the recursion limit would allow a recursive dump
+    depth = 2 * sys.getrecursionlimit()
+    deep = []
+    for i in range(depth):
+        deep = [deep]
+    out = io.StringIO()
+    Dumper(max_depth=depth + 1, output=out).dump(deep)
+    lines = out.getvalue().strip().split("\n")
+    assert len(lines) == depth + 1
+    assert lines[-1] == "  " * depth + "0: []"
+
+def test_type_names():
+    assert dumps({'a': [1]}).startswith("<dictionary at 0x")
+    assert dumps([[1]]).startswith("<list at 0x")
+    assert dumps(([1],)).startswith("<tuple at 0x")
+    assert dumper.get_type_name(type(dumper)) == 'module'
+    assert dumper.get_type_name(type(None)) == 'None'
+    assert dumper.object_summary(len).startswith("<builtin at 0x")
+
+class FakeOOBTree:
+    __slots__ = ('items_',) # no __dict__, like the real (C) BTrees
+    __module__ = 'BTrees.OOBTree'
+    def __init__(self, items):
+        self.items_ = items
+    def __len__(self):
+        return len(self.items_)
+    def __iter__(self):
+        return iter(self.items_)
+    def __getitem__(self, key):
+        return self.items_[key]
+    def items(self):
+        return self.items_.items()
+
+def test_dump_btree():
+    btrees = types.ModuleType('BTrees')
+    oobtree = types.ModuleType('BTrees.OOBTree')
+    oobtree.OOBTree = FakeOOBTree
+    unrelated = types.ModuleType('BTree') # someone's own BTree.py
+    unrelated.x = 1
+    saved = dict((name, sys.modules.get(name))
+                 for name in ('BTrees', 'BTrees.OOBTree', 'BTree'))
+    sys.modules.update({'BTrees': btrees, 'BTrees.OOBTree': oobtree,
+                        'BTree': unrelated})
+    try:
+        lines = dumps(FakeOOBTree({'b': [1], 'a': [2]})).strip().split("\n")
+        assert lines[0].startswith("<FakeOOBTree at 0x")
+        assert lines[1:] == ["  a: [2]", "  b: [1]"]
+        assert ('BTree', 'BTree') in dumper._btree_pending
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                del sys.modules[name]
+            else:
+                sys.modules[name] = module
+
+def test_fastpath_matches_pure_python():
+    pytest.importorskip("dumper._fastpath")
+    import enum
+    class Color(enum.IntEnum):
+        RED = 1
+    class S(str): pass
+    class L(list): pass
+    class Plain: pass
+    values = [None, True, 1, 1.5, 2j, 'a', b'b', S('s'), Color.RED,
+              [], (), {}, [1, 'a'], (1, [2]), list(range(11)),
+              {'a': 1}, {'a': [1]}, dict.fromkeys(range(6)),
+              L([1]), L([[1]]), Plain(), Plain, len, dumper, FakeOOBTree({})]
+    fast = dumper._fastpath
+    pure = dumper._PURE_PYTHON
+    for val in values:
+        assert fast.short_value(val) == pure['short_value'](val), val
+        assert fast.is_instance(val) == pure['is_instance'](val), val
+        assert fast.is_class(val) == pure['is_class'](val), val
+        assert fast.atomic_type(type(val)) == \
+            pure['atomic_type'](type(val)), val
+        assert fast.get_type_name(type(val)) == \
+            pure['get_type_name'](type(val)), val
+
+def test_dump_instance_odd_module():
+    class K: pass
+    K.__module__ = None
+    assert dumps(K()).startswith("<K at ")
+
+def test_instance_dump_across_modules(tmp_path, monkeypatch):
+    # dumptest_a.b.m1.Foo holds instances from dumptest_a.b.m2 (same
+    # package) and dumptest_c.m4 (different package)
+    for pkg in ("dumptest_a", "dumptest_a/b", "dumptest_c"):
+        (tmp_path / pkg).mkdir()
+        (tmp_path / pkg / "__init__.py").write_text("")
+    (tmp_path / "dumptest_a/b/m1.py").write_text("class Foo: pass\n")
+    (tmp_path / "dumptest_a/b/m2.py").write_text("class Bar: pass\n")
+    (tmp_path / "dumptest_c/m4.py").write_text("class Baz: pass\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    from dumptest_a.b.m1 import Foo
+    from dumptest_a.b.m2 import Bar
+    from dumptest_c.m4 import Baz
+    f = Foo()
+    f.bar = Bar()
+    f.bar.s = 'bar'
+    f.baz = Baz()
+    f.baz.s = 'baz'
+
+    def dumped_with(mode):
+        monkeypatch.setattr(dumper, "instance_dump", mode)
+        return dumps(f)
+
+    out = dumped_with('module')
+    assert "suppressed (instance from different module)" in out
+    assert "'bar'" not in out and "'baz'" not in out
+    out = dumped_with('package')
+    assert "s: 'bar'" in out
+    assert "suppressed (instance from different package)" in out
+    assert "'baz'" not in out
+    out = dumped_with('all')
+    assert "s: 'bar'" in out and "s: 'baz'" in out
+    assert "suppressed" not in out
+
+def test_dumper_settings_only():
+    d = Dumper(max_depth=3)
+    assert d.max_depth == 3
+    assert d.instance_dump == dumper.instance_dump # from the module
+    d.max_depth = 4
+    assert d._max_depth == 4
+    # internal state doesn't go through the '_' + name mapping
+    for name in ('buf', 'stack', 'short_cache', 'eff_max_depth'):
+        assert not hasattr(d, name), name
+    d.stack = 'mine'
+    assert d._stack is None
+    d.out = io.StringIO()
+    d.dump([[1]])
+    assert d.out.getvalue().endswith("  0: [1]\n")
+
+def test_dumps_small_values_skip_setattr(monkeypatch):
+    # dumps() of a few small values is mostly fixed cost, and going
+    # through Dumper.__setattr__ for the per-dump state used to make it
+    # ~2x slower; keep that state off __setattr__ entirely
+    calls = []
+    def counting_setattr(self, attr, val):
+        calls.append(attr)
+        self.__dict__[attr] = val
+    monkeypatch.setattr(Dumper, "__setattr__", counting_setattr)
+    assert dumps(1, 'a', [1]) == "1'a'[1]"
+    assert calls == []
+
+def test_dump_dict_sorted():
+    # skip the summary line, it has the id in it
+    lines = dumps({'c': [1], 'a': [2], 'b': 3}).strip().split("\n")
+    assert lines[1:] == ["  a: [2]", "  b: 3", "  c: [1]"]
+    # keys that can't be compared come out in dict order
+    lines = dumps({2: [1], 'x': [2], 1: [3]}).strip().split("\n")
+    assert lines[1:] == ["  2: [1]", "  x: [2]", "  1: [3]"]
+
+def test_dump_containers_directly():
+    out = io.StringIO()
+    Dumper(output=out).dump_dict({'b': [1, [2]], 'a': 1}, 0, '')
+    lines = out.getvalue().split("\n")
+    assert lines[0] == "a: 1"
+    assert lines[1].startswith("b: <list at 0x")
+    assert lines[2:4] == ["  0: 1", "  1: [2]"]
+    out = io.StringIO()
+    Dumper(output=out).dump_sequence(['x', 2], 0, '  ')
+    assert out.getvalue() == "  0: 'x'\n  1: 2\n"
+    class Plain: pass
+    p = Plain()
+    p.x = 1
+    out = io.StringIO()
+    Dumper(output=out).dump_instance(p, 0, '', summarize=0)
+    assert out.getvalue() == "x: 1\n"
+
+def test_atomic_types_capped(monkeypatch):
+    atomic_type = dumper._PURE_PYTHON['atomic_type']
+    monkeypatch.setattr(dumper, "_MAX_ATOMIC_TYPES",
+                        len(dumper._ATOMIC_TYPES))
+    Number = type('Number', (int,), {})
+    assert atomic_type(Number)
+    assert Number not in dumper._ATOMIC_TYPES
+    ref = weakref.ref(Number)
+    del Number
+    gc.collect()
+    assert ref() is None
     
 # END TEST CASES
     
 def text_type(val):
-    if sys.version < '3':
+    if sys.version_info < (3, 0):
         return unicode(val)
     else:
         return str(val)